@@ -3,7 +3,8 @@ from flask_cors import CORS
 from datetime import datetime
 from models import db, User, Expense, Budget, AlertSetting, ExpenseGroup, GroupMember, GroupExpense
 from config import Config
-from utils import CATEGORIES, check_budget_alerts, send_alert_email
+from utils import CATEGORIES, check_budget_alerts, send_alert_email, route_to_user_shard
+from sharding import shard_binds, shard_bind_key, create_shard_tables
 import json
 from dotenv import load_dotenv
 import os
@@ -12,12 +13,15 @@ load_dotenv()
 
 app = Flask(__name__)
 app.config.from_object(Config)
+app.config['SQLALCHEMY_BINDS'] = shard_binds(app.config)
 CORS(app)
 
 db.init_app(app)
 
 with app.app_context():
     db.create_all()
+    for shard in range(app.config['SHARD_COUNT']):
+        create_shard_tables(db.engines[shard_bind_key(shard)], db.metadata)
 
 # ============ USER ENDPOINTS ============
 
@@ -33,6 +37,9 @@ def create_user():
     db.session.add(user)
     db.session.commit()
     
+    # Assign the new user to a shard
+    route_to_user_shard(user.id)
+    
     return jsonify(user.to_dict()), 201
 
 @app.route('/api/users', methods=['GET'])
@@ -64,6 +71,9 @@ def search_users():
 def create_expense():
     data = request.json
     
+    if not route_to_user_shard(data.get('user_id')):
+        return jsonify({'error': 'user_id is required'}), 400
+    
     expense = Expense(
         user_id=data['user_id'],
         amount=float(data['amount']),
@@ -128,6 +138,9 @@ def get_expenses():
     month = request.args.get('month', type=int)
     year = request.args.get('year', type=int)
     
+    if not route_to_user_shard(user_id):
+        return jsonify({'error': 'user_id is required'}), 400
+    
     query = Expense.query
     
     if user_id:
@@ -147,7 +160,13 @@ def get_expenses():
 
 @app.route('/api/expenses/<int:expense_id>', methods=['DELETE'])
 def delete_expense(expense_id):
+    user_id = request.args.get('user_id', type=int)
+    if not route_to_user_shard(user_id):
+        return jsonify({'error': 'user_id is required'}), 400
+    
     expense = Expense.query.get_or_404(expense_id)
+    if user_id and expense.user_id != user_id:
+        return jsonify({'error': 'Expense not found'}), 404
     db.session.delete(expense)
     db.session.commit()
     return jsonify({'message': 'Expense deleted'}), 200
@@ -158,6 +177,9 @@ def delete_expense(expense_id):
 def create_budget():
     data = request.json
     
+    if not route_to_user_shard(data.get('user_id')):
+        return jsonify({'error': 'user_id is required'}), 400
+    
     # Check if budget already exists
     existing = Budget.query.filter_by(
         user_id=data['user_id'],
@@ -190,6 +212,9 @@ def get_budgets():
     month = request.args.get('month', type=int)
     year = request.args.get('year', type=int)
     
+    if not route_to_user_shard(user_id):
+        return jsonify({'error': 'user_id is required'}), 400
+    
     query = Budget.query
     
     if user_id:
@@ -204,7 +229,13 @@ def get_budgets():
 
 @app.route('/api/budgets/<int:budget_id>', methods=['DELETE'])
 def delete_budget(budget_id):
+    user_id = request.args.get('user_id', type=int)
+    if not route_to_user_shard(user_id):
+        return jsonify({'error': 'user_id is required'}), 400
+    
     budget = Budget.query.get_or_404(budget_id)
+    if user_id and budget.user_id != user_id:
+        return jsonify({'error': 'Budget not found'}), 404
     db.session.delete(budget)
     db.session.commit()
     return jsonify({'message': 'Budget deleted'}), 200
@@ -215,6 +246,9 @@ def delete_budget(budget_id):
 def create_alert_setting():
     data = request.json
     
+    if not route_to_user_shard(data.get('user_id')):
+        return jsonify({'error': 'user_id is required'}), 400
+    
     existing = AlertSetting.query.filter_by(
         user_id=data['user_id'],
         category=data['category']
@@ -243,6 +277,7 @@ def get_alert_settings():
     user_id = request.args.get('user_id', type=int)
     if not user_id:
         return jsonify({'error': 'user_id is required'}), 400
+    route_to_user_shard(user_id)
     settings = AlertSetting.query.filter_by(user_id=user_id).all()
     return jsonify([s.to_dict() for s in settings])
 
@@ -257,6 +292,8 @@ def monthly_summary():
     if not all([user_id, month, year]):
         return jsonify({'error': 'user_id, month, and year are required'}), 400
     
+    route_to_user_shard(user_id)
+    
     start_date = datetime(year, month, 1)
     if month == 12:
         end_date = datetime(year + 1, 1, 1)
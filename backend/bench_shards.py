@@ -0,0 +1,89 @@
+"""Benchmark expense write throughput against the number of SQLite shards.
+
+Each worker process inserts expenses for random users, routing every write to
+the user's hash shard and committing it on its own, like POST /api/expenses.
+With one shard every commit waits on the same file lock.
+
+    python bench_shards.py --shards 1,2,4,8 --workers 8 --writes 300
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+import sqlalchemy as sa
+
+from models import db
+from sharding import create_shard_tables, hash_shard
+
+
+def _engine(path):
+    return sa.create_engine(f'sqlite:///{path}', connect_args={'timeout': 60})
+
+
+def _worker(paths, writes, users, seed, start):
+    engines = [_engine(path) for path in paths]
+    expense = db.metadata.tables['expense']
+    rng = random.Random(seed)
+    start.wait()
+    for _ in range(writes):
+        user_id = rng.randint(1, users)
+        with engines[hash_shard(user_id, len(engines))].begin() as conn:
+            conn.execute(expense.insert().values(
+                user_id=user_id,
+                amount=round(rng.uniform(1, 100), 2),
+                category='Food',
+                description='benchmark',
+                date=datetime.now(),
+                created_at=datetime.now()
+            ))
+
+
+def run(shard_count, workers, writes, users):
+    """Return writes per second for one shard count"""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f'shard_{shard}.db') for shard in range(shard_count)]
+        for path in paths:
+            create_shard_tables(_engine(path), db.metadata)
+
+        start = multiprocessing.Event()
+        procs = [
+            multiprocessing.Process(target=_worker, args=(paths, writes, users, seed, start))
+            for seed in range(workers)
+        ]
+        for proc in procs:
+            proc.start()
+
+        began = time.perf_counter()
+        start.set()
+        for proc in procs:
+            proc.join()
+        elapsed = time.perf_counter() - began
+
+        if any(proc.exitcode for proc in procs):
+            raise RuntimeError('a benchmark worker failed')
+        return workers * writes / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shards', default='1,2,4,8', help='comma separated shard counts')
+    parser.add_argument('--workers', type=int, default=8, help='concurrent writer processes')
+    parser.add_argument('--writes', type=int, default=300, help='writes per worker')
+    parser.add_argument('--users', type=int, default=1000, help='distinct users to spread writes over')
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers x {args.writes} writes, {args.users} users")
+    print(f"{'shards':>6} {'writes/s':>10} {'speedup':>8}")
+    baseline = None
+    for shard_count in [int(n) for n in args.shards.split(',')]:
+        rate = run(shard_count, args.workers, args.writes, args.users)
+        baseline = baseline or rate
+        print(f"{shard_count:>6} {rate:>10.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,10 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///expense.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Sharding (optional - set SHARD_COUNT > 0 to spread per-user data over several databases)
+    SHARD_COUNT = int(os.environ.get('SHARD_COUNT', 0))
+    SHARD_DATABASE_URL = os.environ.get('SHARD_DATABASE_URL') or 'sqlite:///expense_shard_{shard}.db'
+    
     # Email configuration (optional - set these environment variables to enable email)
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.environ.get('MAIL_PORT', 587))
@@ -0,0 +1,99 @@
+"""Move users' per-user data between shards.
+
+Stop the API before running this. Every user is moved to its hash shard for
+--shards databases (default: SHARD_COUNT), or a single user to an explicit shard:
+
+    SHARD_COUNT=4 python rebalance_shards.py
+    SHARD_COUNT=4 python rebalance_shards.py --user 7 --to 2
+
+To shrink from 8 to 4 shards, run with every shard still configured, then
+restart the API with SHARD_COUNT=4:
+
+    SHARD_COUNT=8 python rebalance_shards.py --shards 4
+
+Rows left in the catalog's per-user tables (data from before sharding was
+enabled) are moved into the user's shard as well. Moved rows get new ids.
+"""
+import argparse
+
+from app import app
+from models import db, User, UserShard
+from sharding import SHARDED_TABLES, hash_shard, shard_bind_key
+
+
+def move_rows(user_id, source, target, dry_run=False):
+    """Copy a user's rows from the source engine to the target engine, then delete them from the source"""
+    moved = 0
+    # The target commits first, so a failure can leave duplicates but never loses rows
+    with source.begin() as src, target.begin() as dst:
+        for name in SHARDED_TABLES:
+            table = db.metadata.tables[name]
+            rows = src.execute(table.select().where(table.c.user_id == user_id)).mappings().all()
+            moved += len(rows)
+            if rows and not dry_run:
+                dst.execute(table.insert(), [{k: v for k, v in row.items() if k != 'id'} for row in rows])
+                src.execute(table.delete().where(table.c.user_id == user_id))
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shards', type=int, help='number of shards to balance over (default: SHARD_COUNT)')
+    parser.add_argument('--user', type=int, help='only move this user')
+    parser.add_argument('--to', type=int, help='explicit target shard for --user')
+    parser.add_argument('--dry-run', action='store_true', help='report moves without changing anything')
+    args = parser.parse_args()
+
+    shard_count = app.config['SHARD_COUNT']
+    target_count = args.shards or shard_count
+    if not shard_count:
+        parser.error('set SHARD_COUNT to the number of configured shards')
+    if target_count > shard_count:
+        parser.error('--shards cannot exceed SHARD_COUNT')
+    if args.to is not None and args.user is None:
+        parser.error('--to requires --user')
+    if args.to is not None and not 0 <= args.to < shard_count:
+        parser.error(f'--to must be between 0 and {shard_count - 1}')
+
+    with app.app_context():
+        if args.user:
+            if not db.session.get(User, args.user):
+                parser.error(f'user {args.user} does not exist')
+            user_ids = [args.user]
+        else:
+            user_ids = db.session.execute(db.select(User.id).order_by(User.id)).scalars().all()
+
+        total_moved = 0
+        for user_id in user_ids:
+            placement = db.session.get(UserShard, user_id)
+            target = args.to if args.to is not None else hash_shard(user_id, target_count)
+            target_engine = db.engines[shard_bind_key(target)]
+
+            if placement and placement.shard >= shard_count:
+                print(f"❌ User {user_id} is on shard {placement.shard}, which is not configured. Raise SHARD_COUNT.")
+                continue
+
+            # Legacy rows from before sharding was enabled
+            moved = move_rows(user_id, db.engine, target_engine, args.dry_run)
+
+            if placement and placement.shard != target:
+                moved += move_rows(user_id, db.engines[shard_bind_key(placement.shard)], target_engine, args.dry_run)
+
+            if placement and placement.shard == target and not moved:
+                continue
+
+            print(f"{'Would move' if args.dry_run else 'Moved'} user {user_id} to shard {target} ({moved} rows)")
+            total_moved += moved
+
+            if not args.dry_run:
+                if placement:
+                    placement.shard = target
+                else:
+                    db.session.add(UserShard(user_id=user_id, shard=target))
+                db.session.commit()
+
+        print(f"✅ Done, {total_moved} rows {'to move' if args.dry_run else 'moved'}")
+
+
+if __name__ == '__main__':
+    main()
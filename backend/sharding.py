@@ -0,0 +1,73 @@
+"""Optional sharding of per-user tables across several databases.
+
+With SHARD_COUNT = 0 (the default) everything lives in SQLALCHEMY_DATABASE_URI.
+With SHARD_COUNT > 0 that database becomes the global catalog (users, shard
+placements, groups) and the per-user tables listed in SHARDED_TABLES are routed
+to one of SHARD_COUNT shard databases, picked per user.
+"""
+import hashlib
+
+import sqlalchemy as sa
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy.schema import CreateTable
+
+SHARDED_TABLES = ('expense', 'budget', 'alert_setting')
+
+
+def shard_bind_key(shard):
+    return f'shard{shard}'
+
+
+def hash_shard(user_id, shard_count):
+    """Default shard for a user, stable across processes and restarts"""
+    return int(hashlib.sha1(str(user_id).encode()).hexdigest(), 16) % shard_count
+
+
+def shard_binds(config):
+    """Build the SQLALCHEMY_BINDS entries for the configured shards"""
+    binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+    for shard in range(config['SHARD_COUNT']):
+        binds[shard_bind_key(shard)] = config['SHARD_DATABASE_URL'].format(shard=shard)
+    return binds
+
+
+def create_shard_tables(engine, metadata):
+    """Create the per-user tables on a shard.
+
+    Foreign keys are left out because the tables they point at (user,
+    group_expense) live in the catalog database.
+    """
+    with engine.begin() as conn:
+        existing = set(sa.inspect(conn).get_table_names())
+        for name in SHARDED_TABLES:
+            if name not in existing:
+                conn.execute(CreateTable(metadata.tables[name], include_foreign_key_constraints=[]))
+
+
+def _sharded_table(mapper, clause):
+    table = None
+    if mapper is not None:
+        table = sa.inspect(mapper).local_table
+    elif isinstance(clause, sa.Table):
+        table = clause
+    elif isinstance(clause, sa.UpdateBase) and isinstance(clause.table, sa.Table):
+        table = clause.table
+    return table is not None and table.name in SHARDED_TABLES
+
+
+class RoutingSession(Session):
+    """Session that sends per-user tables to the shard stored in ``info['shard']``.
+
+    Everything else goes to the catalog through the default Flask-SQLAlchemy
+    bind lookup.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _sharded_table(mapper, clause):
+            shard = self.info.get('shard')
+            if shard is not None:
+                return self._db.engines[shard_bind_key(shard)]
+            if current_app.config.get('SHARD_COUNT'):
+                raise RuntimeError('Sharding is enabled but no user shard is selected for this session')
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
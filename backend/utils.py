@@ -1,11 +1,38 @@
 from datetime import datetime
-from models import db, Budget, Expense, AlertSetting
+from models import db, User, Budget, Expense, AlertSetting, UserShard
+from sharding import hash_shard
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 CATEGORIES = ['Food', 'Transport', 'Entertainment', 'Shopping', 'Bills', 'Healthcare', 'Education', 'Other']
 
+def route_to_user_shard(user_id):
+    """Point the session's per-user tables at the shard holding user_id.
+
+    Returns False when sharding is enabled and no user_id was given.
+    """
+    from flask import current_app
+    
+    shard_count = current_app.config.get('SHARD_COUNT')
+    if not shard_count:
+        return True
+    if not user_id:
+        return False
+    
+    # Pin the placement so users stay put if SHARD_COUNT changes later
+    placement = db.session.get(UserShard, user_id)
+    if placement:
+        shard = placement.shard
+    else:
+        shard = hash_shard(user_id, shard_count)
+        if db.session.get(User, user_id):
+            db.session.add(UserShard(user_id=user_id, shard=shard))
+            db.session.commit()
+    
+    db.session.info['shard'] = shard
+    return True
+
 def check_budget_alerts(user_id, category, month, year):
     """Check if expense exceeds budget and return alert info"""
     budget = Budget.query.filter_by(
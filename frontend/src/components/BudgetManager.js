@@ -41,7 +41,7 @@ function BudgetManager({ userId, categories }) {
   const handleDelete = async (id) => {
     if (window.confirm('Are you sure you want to delete this budget?')) {
       try {
-        await deleteBudget(id);
+        await deleteBudget(id, userId);
         loadBudgets();
       } catch (error) {
         window.alert('Error deleting budget: ' + error.message);
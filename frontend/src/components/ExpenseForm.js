@@ -47,7 +47,7 @@ function ExpenseForm({ userId, categories }) {
   const handleDelete = async (id) => {
     if (window.confirm('Are you sure you want to delete this expense?')) {
       try {
-        await deleteExpense(id);
+        await deleteExpense(id, userId);
         loadExpenses();
       } catch (error) {
         window.alert('Error deleting expense: ' + error.message);
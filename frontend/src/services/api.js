@@ -17,12 +17,12 @@ export const getUser = (id) => api.get(`/users/${id}`);
 // Expenses
 export const getExpenses = (params) => api.get('/expenses', { params });
 export const createExpense = (data) => api.post('/expenses', data);
-export const deleteExpense = (id) => api.delete(`/expenses/${id}`);
+export const deleteExpense = (id, userId) => api.delete(`/expenses/${id}`, { params: { user_id: userId } });
 
 // Budgets
 export const getBudgets = (params) => api.get('/budgets', { params });
 export const createBudget = (data) => api.post('/budgets', data);
-export const deleteBudget = (id) => api.delete(`/budgets/${id}`);
+export const deleteBudget = (id, userId) => api.delete(`/budgets/${id}`, { params: { user_id: userId } });
 
 // Alert Settings
 export const getAlertSettings = (userId) => api.get('/alert-settings', { params: { user_id: userId } });